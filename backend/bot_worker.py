@@ -3,8 +3,9 @@ import io
 import logging
 import os
 import time
-import struct
-from typing import Dict, Optional, List
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Optional, List, Tuple
 
 from dotenv import load_dotenv
 
@@ -13,14 +14,18 @@ from livekit import rtc
 from livekit.api import AccessToken, VideoGrants
 from livekit.rtc.audio_frame import AudioFrame
 from livekit.rtc import AudioStream
+import av
 import numpy as np
 from pydub import AudioSegment
 
 from backend.murf_api import (
-    speech_to_text,
+    speech_to_text_sentences,
     translate_text_murf,
     generate_speech_from_text,
+    stream_speech_from_text_async,
     get_default_voice,
+    local_stt_available,
+    container_kind,
 )
 
 logger = logging.getLogger("bot")
@@ -45,39 +50,73 @@ LIVEKIT_URL = os.getenv("LIVEKIT_URL")
 
 SILENCE_THRESHOLD = 100  
 SILENCE_SECONDS_TO_END = 0.5  
+# Long turns are cut here so STT starts while the speaker is still talking
+MAX_SPEECH_SECONDS = 4.0
+# A forced cut lands on the quietest CUT_FRAME_MS frame within this much of the limit,
+# so it falls between words rather than through one
+CUT_SEARCH_SECONDS = 0.5
+CUT_FRAME_MS = 20
 MIN_SPEECH_BYTES = int(16000 * 2 * 1) 
 MAX_CONCURRENT_TTS = 3  
 FRAME_MS = 20  
-
-
-def _rms_of_pcm16(pcm_bytes: bytes) -> float:
-    """Compute a quick RMS of int16 PCM bytes."""
-    if not pcm_bytes:
-        return 0.0
+TTS_SAMPLE_RATE = 24000
+# LiveKit resamples subscribed audio to this rate natively, so captured frames are already STT-ready
+STT_SAMPLE_RATE = 16000
+
+# Local model inference shares one CUDA context, so it gets a single worker;
+# Murf / STT API calls are network bound and can run side by side.
+GPU_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-gpu")
+NET_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bot-net")
+# Audio decode/resample: PyAV releases the GIL while decoding, so threads use separate
+# cores without pickling every blob to a child process and the PCM back.
+DECODE_POOL = ThreadPoolExecutor(max_workers=max(2, (os.cpu_count() or 2) // 2), thread_name_prefix="bot-decode")
+
+
+async def _run_in(pool: Executor, fn, *args, **kwargs):
+    """Run a blocking call on the given pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool, functools.partial(fn, *args, **kwargs))
+
+
+def _quietest_cut(pcm: bytearray, sample_rate: int) -> int:
+    """Byte offset to split PCM16 at: the middle of the quietest frame in its last CUT_SEARCH_SECONDS."""
+    frame = sample_rate * CUT_FRAME_MS // 1000
+    total = len(pcm) // 2
+    n_frames = min(int(sample_rate * CUT_SEARCH_SECONDS) // frame, total // frame)
+    if n_frames == 0:
+        return len(pcm)
+    start = total - n_frames * frame
+    tail = np.frombuffer(pcm, dtype="<i2", count=n_frames * frame, offset=start * 2)
+    tail = tail.astype(np.float32).reshape(n_frames, frame)
+    quietest = int(np.einsum("ij,ij->i", tail, tail).argmin())
+    return (start + quietest * frame + frame // 2) * 2
+
+
+def _rms_of_pcm16(pcm_bytes: bytes, scratch: Optional[np.ndarray] = None) -> float:
+    """Compute a quick RMS of int16 PCM bytes.
+
+    Pass a float32 `scratch` array owned by the caller to convert into it instead
+    of allocating per call; it is used only if it is large enough.
+    """
     count = len(pcm_bytes) // 2
     if count == 0:
         return 0.0
-    fmt = f"<{count}h"
-    try:
-        samples = struct.unpack(fmt, pcm_bytes[: count * 2])
-    except Exception:
-        sm = 0
-        for i in range(0, len(pcm_bytes) - 1, 2):
-            s = int.from_bytes(pcm_bytes[i : i + 2], "little", signed=True)
-            sm += s * s
-        return (sm / max(1, count)) ** 0.5
-    sm = 0
-    for s in samples:
-        sm += s * s
-    return (sm / count) ** 0.5
-
-def ensure_wav_bytes(pcm_bytes: bytes, sample_rate: int) -> bytes:
-    if sample_rate == 48000 and len(pcm_bytes) % 4 == 0:
-        arr = np.frombuffer(pcm_bytes, dtype=np.float32)
-        arr = np.clip(arr, -1.0, 1.0)
-        arr = (arr * 32767).astype(np.int16)  
-        pcm_bytes = arr.tobytes()
-        sample_rate = 48000
+    pcm = np.frombuffer(pcm_bytes, dtype="<i2", count=count)
+    if scratch is not None and scratch.size >= count:
+        samples = scratch[:count]
+        np.copyto(samples, pcm, casting="unsafe")
+    else:
+        samples = pcm.astype(np.float32)
+    return float(np.sqrt(np.dot(samples, samples) / count))
+
+def ensure_pcm16_16k(pcm_bytes: bytes, sample_rate: int) -> bytes:
+    """Resample a speech chunk to raw 16 kHz mono PCM16LE (STT wraps it only if it must).
+
+    LiveKit AudioFrames already carry int16 samples, so the captured bytes go
+    straight to the resampler with no float round trip.
+    """
+    if sample_rate == 16000:
+        return pcm_bytes
 
     audio = AudioSegment(
         data=pcm_bytes,
@@ -86,39 +125,56 @@ def ensure_wav_bytes(pcm_bytes: bytes, sample_rate: int) -> bytes:
         channels=1
     )
     audio = audio.set_frame_rate(16000).set_channels(1).set_sample_width(2)
+    return audio.raw_data
+
+# demuxer to open a sniffed container with directly instead of letting libavformat probe
+_AV_DEMUXER = {"wav": "wav", "ogg": "ogg", "webm": "webm", "mp3": "mp3"}
 
-    buf = io.BytesIO()
-    audio.export(buf, format="wav")
-    return buf.getvalue()
 
-async def _bytes_to_audio_frames_async(audio_bytes: bytes, sample_rate: int = 44100, channels: int = 1, frame_ms: int = FRAME_MS):
+def _decode_to_pcm16(audio_bytes: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Decode a compressed blob (MP3/Ogg/...) to PCM16LE in-process with PyAV, no ffmpeg subprocess."""
+    resampler = av.AudioResampler(format="s16", layout="mono" if channels == 1 else "stereo", rate=sample_rate)
+    pcm_chunks = []
+    demuxer = _AV_DEMUXER.get(container_kind(audio_bytes))
+    with av.open(io.BytesIO(audio_bytes), format=demuxer) as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            for out in resampler.resample(frame):
+                pcm_chunks.append(out.to_ndarray().tobytes())
+    for out in resampler.resample(None):
+        pcm_chunks.append(out.to_ndarray().tobytes())
+    return b"".join(pcm_chunks)
+
+
+async def _bytes_to_audio_frames_async(audio_bytes: bytes, sample_rate: int = TTS_SAMPLE_RATE, channels: int = 1, frame_ms: int = FRAME_MS):
     logger.debug("[tts.frames] starting decode: bytes=%d, sample_rate=%s, channels=%s, frame_ms=%s",
                  len(audio_bytes) if audio_bytes else 0, sample_rate, channels, frame_ms)
     try:
-        audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
-    except Exception as e:
-        logger.exception("[tts.frames] pydub failed to decode TTS bytes")
-        raise
-
-    try:
-        audio = audio.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)  # 16-bit
-        raw = audio.raw_data
-    except Exception as e:
-        logger.exception("[tts.frames] failed to normalize audio: %s", e)
-        raise
+        raw = await _run_in(DECODE_POOL, _decode_to_pcm16, audio_bytes, sample_rate, channels)
+    except Exception:
+        logger.exception("[tts.frames] PyAV failed to decode TTS bytes, falling back to pydub")
+        try:
+            audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
+            audio = audio.set_frame_rate(sample_rate).set_channels(channels).set_sample_width(2)  # 16-bit
+            raw = audio.raw_data
+        except Exception as e:
+            logger.exception("[tts.frames] pydub failed to decode TTS bytes: %s", e)
+            raise
 
     bytes_per_sample = 2
     samples_per_ms = sample_rate / 1000.0
     samples_per_chunk = int(samples_per_ms * frame_ms)
     bytes_per_chunk = samples_per_chunk * channels * bytes_per_sample
 
+    # AudioFrame copies its input, so frames are cut as views of the decoded PCM
+    view = memoryview(raw)
     idx = 0
     total = len(raw)
     frame_count = 0
     while idx < total:
-        chunk = raw[idx : idx + bytes_per_chunk]
+        chunk = view[idx : idx + bytes_per_chunk]
         if len(chunk) < bytes_per_chunk:
-            chunk = chunk + (b"\x00" * (bytes_per_chunk - len(chunk)))
+            chunk = bytes(chunk) + (b"\x00" * (bytes_per_chunk - len(chunk)))
         frame = AudioFrame(chunk, sample_rate, channels, samples_per_chunk)
         frame_count += 1
         logger.debug("[tts.frames] yielding frame %d (bytes=%d)", frame_count, len(chunk))
@@ -128,18 +184,52 @@ async def _bytes_to_audio_frames_async(audio_bytes: bytes, sample_rate: int = 44
     logger.debug("[tts.frames] finished yielding %d frames", frame_count)
 
 
+async def _pcm_queue_to_audio_frames_async(chunks: asyncio.Queue, sample_rate: int, channels: int = 1, frame_ms: int = FRAME_MS):
+    """Re-slice streamed PCM16LE chunks into fixed-size AudioFrames as they arrive (None ends the stream)."""
+    samples_per_chunk = int(sample_rate / 1000.0 * frame_ms)
+    bytes_per_chunk = samples_per_chunk * channels * 2
+    pending = bytearray()
+    frame_count = 0
+    while True:
+        data = await chunks.get()
+        if data is None:
+            break
+        pending.extend(data)
+        # Cut every whole frame through one view, then compact the buffer once per
+        # network chunk instead of shifting it after each 20 ms frame.
+        frames = []
+        off = 0
+        with memoryview(pending) as view:
+            while len(pending) - off >= bytes_per_chunk:
+                frames.append(AudioFrame(view[off:off + bytes_per_chunk], sample_rate, channels, samples_per_chunk))
+                off += bytes_per_chunk
+        del pending[:off]
+        for frame in frames:
+            frame_count += 1
+            yield frame
+    if pending:
+        pending.extend(b"\x00" * (bytes_per_chunk - len(pending)))
+        frame_count += 1
+        yield AudioFrame(bytes(pending), sample_rate, channels, samples_per_chunk)
+    logger.debug("[tts.stream] finished yielding %d frames", frame_count)
+
+
 class TranslatorAgent(Agent):
     def __init__(self) -> None:
         super().__init__(instructions="You are a low-latency relay agent. Forward speech in each listener's language.")
         self.user_prefs: Dict[str, Dict[str, str]] = {}
+        # (user_id, language, voice) per listener, rebuilt whenever prefs change and
+        # read as one immutable snapshot on the per-sentence fan-out path
+        self._listeners: Tuple[Tuple[str, str, str], ...] = ()
         self._tts_sema = asyncio.Semaphore(MAX_CONCURRENT_TTS)
+        self._bg_tasks: set = set()
 
     async def on_enter(self):
         logger.info("[agent] joined session")
         try:
-            voice = get_default_voice("hi-IN")
+            voice = await _run_in(NET_POOL, get_default_voice, "hi-IN")
             logger.debug("[agent] generating join announcement TTS (voice=%s)", voice)
-            tts_blob = await asyncio.to_thread(
+            tts_blob = await _run_in(NET_POOL,
                 generate_speech_from_text,
                 "Translator bot has joined the room.",
                 language="hi-IN",
@@ -147,7 +237,7 @@ class TranslatorAgent(Agent):
             )
             logger.debug("[agent] join TTS blob len=%s", len(tts_blob) if tts_blob else None)
             if tts_blob:
-                audio_iter = _bytes_to_audio_frames_async(tts_blob, sample_rate=44100, channels=1, frame_ms=FRAME_MS)
+                audio_iter = _bytes_to_audio_frames_async(tts_blob, sample_rate=TTS_SAMPLE_RATE, channels=1, frame_ms=FRAME_MS)
                 try:
                     await self.session.say("", audio=audio_iter)
                     logger.info("[agent] announced join message via session.say()")
@@ -160,80 +250,136 @@ class TranslatorAgent(Agent):
         if not language:
             language = "hi-IN"
         if not voice:
-            voice = get_default_voice(language)
+            voice = await _run_in(NET_POOL, get_default_voice, language)
         self.user_prefs[user_id] = {"language": language, "voice": voice}
+        self._listeners = tuple((uid, p["language"], p["voice"]) for uid, p in self.user_prefs.items())
         logger.info(f"[agent] prefs set for {user_id} -> {language}, {voice}")
 
-    async def _translate_and_play_for_target(self, recognized_text: str, from_lang: str, target_id: str, to_lang: str, voice: str ,speaker_id : str):
-        """Translate recognized_text to to_lang, synthesize audio and stream into session.say(audio=...)."""
-        logger.debug("[agent] translate_and_play start: target=%s, to_lang=%s, voice=%s", target_id, to_lang, voice)
+    def _start_tts_stream(self, text: str, language: str, voice: str, label: str) -> asyncio.Queue:
+        """Start streaming TTS in the background; PCM chunks land on the returned queue, then None."""
+        chunks: asyncio.Queue = asyncio.Queue()
 
-        if target_id == speaker_id:
-            logger.debug("[agent] skipping playback to original speaker %s", speaker_id)
-            return
-        async with self._tts_sema:
-            try:
-                translated = await asyncio.to_thread(translate_text_murf, recognized_text, target_language=to_lang)
-                logger.info("[agent] translated for %s -> %s : %r", target_id, to_lang, translated)
-                if not translated:
-                    logger.warning("[agent] empty translation for target %s", target_id)
-                    return
-
-                tts_blob = await asyncio.to_thread(generate_speech_from_text, translated, language=to_lang, voice=voice)
-                logger.info("[agent] tts bytes len for %s : %s", target_id, len(tts_blob) if tts_blob else "None")
-                if not tts_blob:
-                    logger.warning("[agent] empty TTS blob for target %s", target_id)
-                    return
-
-                audio_iter = _bytes_to_audio_frames_async(tts_blob, sample_rate=44100, channels=1, frame_ms=FRAME_MS)
+        async def _pump():
+            received = 0
+            async with self._tts_sema:
                 try:
-                    logger.debug("[agent] calling session.say() for target %s", target_id)
-                    await self.session.say("", audio=audio_iter)
-                    logger.info("[agent] successfully streamed audio for target %s", target_id)
+                    async for chunk in stream_speech_from_text_async(text, language=language, voice=voice, sample_rate=TTS_SAMPLE_RATE):
+                        if chunk:
+                            received += len(chunk)
+                            await chunks.put(chunk)
                 except Exception:
-                    logger.exception("[agent] failed to say audio for target %s", target_id)
+                    logger.exception("[agent] TTS stream failed for %s", label)
+                finally:
+                    logger.info("[agent] tts stream bytes for %s : %d", label, received)
+                    await chunks.put(None)
+
+        task = asyncio.create_task(_pump())
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return chunks
+
+    async def _translate(self, text: str, to_lang: str) -> str:
+        """Translate text once; shared by every (to_lang, voice) group that needs it."""
+        async with self._tts_sema:
+            try:
+                translated = await _run_in(NET_POOL, translate_text_murf, text, target_language=to_lang)
+                logger.info("[agent] translated -> %s : %r", to_lang, translated)
+                return translated
             except Exception:
-                logger.exception("[agent] translate/tts failed for target %s", target_id)
+                logger.exception("[agent] translation to %s failed", to_lang)
+                return ""
+
+    async def _play_translation_for_targets(self, translation: asyncio.Task, target_ids: List[str], to_lang: str, voice: str, after: Optional[asyncio.Task] = None):
+        """Synthesize the translation once for all listeners sharing (to_lang, voice) and
+        stream the audio into session.say(audio=...) as it is generated.
+
+        If `after` is given, playback waits for that task (the previous sentence for the
+        same listeners) so sentences are heard in order while synthesis overlaps.
+        """
+        label = ",".join(target_ids)
+        logger.debug("[agent] play start: targets=%s, to_lang=%s, voice=%s", label, to_lang, voice)
+
+        translated = await translation
+        if not translated:
+            logger.warning("[agent] empty translation for targets %s", label)
+            return
 
-    async def handle_speech_chunk(self, pcm_bytes: bytes, sample_rate: int, speaker_id: str):
-        """Take a completed speech chunk (PCM16LE bytes) and fan-out translations to other participants."""
+        chunks = self._start_tts_stream(translated, to_lang, voice, label)
+
+        if after is not None:
+            await asyncio.wait({after})
+
+        audio_iter = _pcm_queue_to_audio_frames_async(chunks, sample_rate=TTS_SAMPLE_RATE, channels=1, frame_ms=FRAME_MS)
+        try:
+            logger.debug("[agent] calling session.say() for targets %s", label)
+            await self.session.say("", audio=audio_iter)
+            logger.info("[agent] successfully streamed audio for targets %s", label)
+        except Exception:
+            logger.exception("[agent] failed to say audio for targets %s", label)
+
+    async def handle_speech_chunk(self, pcm_bytes: bytes, sample_rate: int, speaker_id: str, after: Optional[asyncio.Task] = None):
+        """Take a completed speech chunk (PCM16LE bytes) and fan-out translations to other participants.
+
+        Transcription is streamed sentence by sentence; each sentence is translated and
+        synthesized for every listener while the next one is still being decoded.
+        `after` is the speaker's previous chunk: only playback waits for it.
+        """
         logger.debug("[agent] handle_speech_chunk called: speaker=%s bytes=%d sample_rate=%s", speaker_id, len(pcm_bytes) if pcm_bytes else 0, sample_rate)
         if not pcm_bytes:
             logger.debug("[agent] empty pcm_bytes for %s - skipping", speaker_id)
             return
 
-        speaker_pref = self.user_prefs.get(speaker_id, {"language": "hi-IN", "voice": get_default_voice("hi-IN")})
+        speaker_pref = self.user_prefs.get(speaker_id, {"language": "hi-IN"})
         speaker_lang = speaker_pref.get("language", "en-US")
 
         if len(pcm_bytes) < MIN_SPEECH_BYTES:
             logger.debug("[agent] pcm_bytes too small (%d < %d) - skipping STT", len(pcm_bytes), MIN_SPEECH_BYTES)
             return
 
-        try:
-            logger.debug("[agent] calling STT for speaker=%s (lang=%s)", speaker_id, speaker_lang)
-            recognized = await asyncio.to_thread(speech_to_text, pcm_bytes, 16000, speaker_lang)
-            logger.info("[agent] STT result for %s: %r", speaker_id, recognized)
-        except Exception:
-            logger.exception("[agent] STT failed for speaker %s", speaker_id)
-            return
-
-        if not recognized:
-            logger.debug("[agent] no text recognized for speaker %s", speaker_id)
+        if not any(target_id != speaker_id for target_id, _, _ in self._listeners):
+            logger.debug("[agent] no listeners besides %s - skipping STT", speaker_id)
             return
 
+        logger.debug("[agent] calling STT for speaker=%s (lang=%s)", speaker_id, speaker_lang)
+        sentences = speech_to_text_sentences(pcm_bytes, 16000, speaker_lang)
+        stt_pool = GPU_POOL if local_stt_available() else NET_POOL
+        last_for_group: Dict[tuple, asyncio.Task] = {}
         tasks = []
-        for target_id, pref in self.user_prefs.items():
-            if target_id == speaker_id:
-                continue
-            to_lang = pref.get("language", "hi-IN")
-            voice = pref.get("voice") or get_default_voice(to_lang)
-            logger.debug("[agent] queuing translation for target=%s to_lang=%s", target_id, to_lang)
-            tasks.append(asyncio.create_task(self._translate_and_play_for_target(recognized, speaker_lang, target_id, to_lang, voice, speaker_id)))
+        while True:
+            try:
+                sentence = await _run_in(stt_pool, next, sentences, None)
+            except Exception:
+                logger.exception("[agent] STT failed for speaker %s", speaker_id)
+                break
+            if sentence is None:
+                break
+            logger.info("[agent] STT sentence for %s: %r", speaker_id, sentence)
+
+            groups: Dict[tuple, List[str]] = {}
+            for target_id, to_lang, voice in self._listeners:
+                if target_id == speaker_id:
+                    continue
+                groups.setdefault((to_lang, voice), []).append(target_id)
+
+            translations: Dict[str, asyncio.Task] = {}
+            for (to_lang, voice), target_ids in groups.items():
+                logger.debug("[agent] queuing translation for targets=%s to_lang=%s", target_ids, to_lang)
+                if to_lang not in translations:
+                    translations[to_lang] = asyncio.create_task(self._translate(sentence, to_lang))
+                task = asyncio.create_task(self._play_translation_for_targets(
+                    translations[to_lang], target_ids, to_lang, voice,
+                    after=last_for_group.get((to_lang, voice), after),
+                ))
+                last_for_group[(to_lang, voice)] = task
+                tasks.append(task)
+
+        if not tasks:
+            logger.debug("[agent] no text recognized or no listeners for speaker %s", speaker_id)
+            return
 
-        if tasks:
-            logger.debug("[agent] awaiting %d translation tasks for speaker=%s", len(tasks), speaker_id)
-            await asyncio.gather(*tasks, return_exceptions=True)
-            logger.debug("[agent] translation tasks completed for speaker=%s", speaker_id)
+        logger.debug("[agent] awaiting %d translation tasks for speaker=%s", len(tasks), speaker_id)
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.debug("[agent] translation tasks completed for speaker=%s", speaker_id)
 
 
 class RoomBotHandle:
@@ -315,7 +461,7 @@ class RoomBotHandle:
                         return
 
                     self._lg.info("[bot.on] audio track subscribed from %s", participant.identity)
-                    stream = AudioStream(track)
+                    stream = AudioStream(track, sample_rate=STT_SAMPLE_RATE, num_channels=1)
                     asyncio.create_task(self._read_track_loop(stream, participant))
 
                 except Exception:
@@ -329,24 +475,40 @@ class RoomBotHandle:
         self._lg.info("[bot] started reader for participant %s", getattr(participant, "identity", "<unknown>"))
         buffer = bytearray()
         last_voice_time = time.time()
-        sample_rate = 48000
+        sample_rate = STT_SAMPLE_RATE
         min_speech_bytes = int(sample_rate * 2 * 1)
-
+        frame_rate = None
+        heard_voice = False
+        # Each chunk gets its own task so STT/translation of the next chunk never waits
+        # for this one; `previous` chains them so the speaker is still heard in order.
+        previous: Optional[asyncio.Task] = None
         try:
             async for frame_event in stream:
                 
                 audio_frame = frame_event.frame   
-                data = bytes(audio_frame.data )
+                data = audio_frame.data
                 sr = audio_frame.sample_rate or sample_rate
                 
-                if not isinstance(data, (bytes, bytearray)):
+                if not isinstance(data, (bytes, bytearray, memoryview)):
                     self._lg.warning("[bot.read] received non-bytes data (type=%s) - skipping", type(data))
                     continue
 
+                # extend straight from the frame's buffer and measure the window through
+                # a view, instead of copying both into fresh bytes objects every frame
+                data = memoryview(data).cast("B")
                 buffer.extend(data)
 
-                window_bytes = buffer[-(int(0.2 * sr) * 2):]
-                rms = _rms_of_pcm16(bytes(window_bytes))
+                if sr != frame_rate:
+                    # byte sizes only depend on the rate, which is fixed for the stream
+                    frame_rate = sr
+                    window_bytes = int(0.2 * sr) * 2
+                    max_chunk_bytes = int(sr * 2 * MAX_SPEECH_SECONDS)
+                    # this reader's own buffer for the per-frame RMS conversion
+                    rms_scratch = np.empty(window_bytes // 2, dtype=np.float32)
+
+                window = memoryview(buffer)[-window_bytes:]
+                rms = _rms_of_pcm16(window, rms_scratch)
+                window.release()
 
                 self._lg.debug(
                     "[bot.read] frame received participant=%s sr=%s chunk_len=%d buffer_len=%d rms=%.2f",
@@ -355,29 +517,53 @@ class RoomBotHandle:
 
                 if rms > SILENCE_THRESHOLD:
                     last_voice_time = time.time()
-
-                if (time.time() - last_voice_time) > SILENCE_SECONDS_TO_END and len(buffer) >= min_speech_bytes:
-                    pcm_snapshot = bytes(buffer)
-                    buffer.clear()
+                    heard_voice = True
+
+                end_of_turn = (time.time() - last_voice_time) > SILENCE_SECONDS_TO_END and len(buffer) >= min_speech_bytes
+                if end_of_turn or len(buffer) >= max_chunk_bytes:
+                    if not heard_voice:
+                        # nothing crossed the gate since the last cut: a muted or idle mic
+                        # would otherwise send a second of silence through STT every second
+                        buffer.clear()
+                        continue
+                    heard_voice = False
+                    # a natural pause ends the chunk as is; a forced cut splits at the quietest
+                    # point near the limit and carries the rest into the next chunk
+                    cut = len(buffer) if end_of_turn else _quietest_cut(buffer, sr)
+                    pcm_snapshot = bytes(buffer[:cut])
+                    del buffer[:cut]
 
                     self._lg.debug(
                         "[bot.read] silence detected or max buffer reached, snapshot_len=%d, sending to STT",
                         len(pcm_snapshot)
                     )
 
-                    asyncio.create_task(self._process_speech_chunk(pcm_snapshot, sr, participant.identity))
+                    previous = asyncio.create_task(self._process_speech_chunk(pcm_snapshot, sr, participant.identity, after=previous))
+                    self._tasks.append(previous)
+                    previous.add_done_callback(lambda t: t in self._tasks and self._tasks.remove(t))
 
         except Exception:
             self._lg.exception("[bot] read loop failed for participant %s", getattr(participant, "identity", "<unknown>"))
-    
-    async def _process_speech_chunk(self, pcm_bytes: bytes, sample_rate: int, speaker_id: str):
+
+    async def _process_speech_chunk(self, pcm_bytes: bytes, sample_rate: int, speaker_id: str, after: Optional[asyncio.Task] = None):
+        """Run one captured chunk through STT/translation; `after` is the speaker's previous chunk."""
         self._lg.debug("[bot.proc] _process_speech_chunk called speaker=%s bytes=%d sample_rate=%s", speaker_id, len(pcm_bytes) if pcm_bytes else 0, sample_rate)
         try:
-            wav_bytes = ensure_wav_bytes(pcm_bytes, sample_rate)
-            await self._agent.handle_speech_chunk(wav_bytes, 16000, speaker_id)
+            if sample_rate == STT_SAMPLE_RATE:
+                # the reader subscribes at 16 kHz, so this is the usual case and there is
+                # nothing to resample
+                pcm16 = pcm_bytes
+            else:
+                pcm16 = await _run_in(DECODE_POOL, ensure_pcm16_16k, pcm_bytes, sample_rate)
+            await self._agent.handle_speech_chunk(pcm16, 16000, speaker_id, after=after)
             self._lg.debug("[bot.proc] agent.handle_speech_chunk completed for %s", speaker_id)
         except Exception:
             self._lg.exception("[bot] processing speech chunk failed for %s", speaker_id)
+        finally:
+            # a chunk that played nothing still must not finish before its predecessor,
+            # or the next chunk could start playing over it
+            if after is not None:
+                await asyncio.wait({after})
 
     async def stop(self):
         if self._closed:
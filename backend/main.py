@@ -1,9 +1,9 @@
-import os, json, time, random, string, asyncio, logging
+import os, json, time, random, string, asyncio, logging, functools, hashlib
 from typing import Dict, Optional, List
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.responses import RedirectResponse, HTMLResponse
+from starlette.responses import RedirectResponse, HTMLResponse, Response
 from pydantic import BaseModel
 from authlib.integrations.starlette_client import OAuth
 from urllib.parse import quote
@@ -32,6 +32,17 @@ except Exception:
     AccessToken = None
     VideoGrants = None
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except Exception:
+    orjson = None
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+
+def _dumps(obj) -> str:
+    return orjson.dumps(obj).decode() if orjson is not None else json.dumps(obj)
+
 if not (LIVEKIT_API_KEY and LIVEKIT_API_SECRET and LIVEKIT_URL):
     logger.warning("LiveKit credentials not set. Set LIVEKIT_API_KEY, LIVEKIT_API_SECRET, LIVEKIT_URL in .env")
 
@@ -61,7 +72,7 @@ MAX_ROOM_CAPACITY = 4
 # }
 
 
-app = FastAPI(title="LiveKit Translation bot")
+app = FastAPI(title="LiveKit Translation bot", default_response_class=DefaultResponse)
 app.add_middleware(
     SessionMiddleware, 
     secret_key=os.getenv("SESSION_SECRET_KEY", "super-secret"),
@@ -119,6 +130,33 @@ class LiveKitJoinTokenReq(BaseModel):
     voice: Optional[str] = "default"
 
 
+@functools.cache
+def _room_page_js() -> str:
+    """ROOM_JS with the deployment URLs filled in; all are fixed for the process lifetime."""
+    return (
+        ROOM_JS.replace("{{BACKEND_URL}}", BACKEND_URL)
+        .replace("{{FRONTEND_URL}}", FRONTEND_URL)
+        .replace("{{LIVEKIT_URL}}", LIVEKIT_URL or "")
+    )
+
+
+@functools.cache
+def _room_page_html() -> str:
+    """ROOM_HTML pointing at the current room.js; the version query busts the browser cache on deploy."""
+    version = hashlib.blake2b(_room_page_js().encode(), digest_size=8).hexdigest()
+    return ROOM_HTML.replace("{{ROOM_JS_VERSION}}", version)
+
+
+@app.get("/room.js")
+def room_page_js():
+    # the script carries no per-user state, so browsers can keep it until the version changes
+    return Response(
+        _room_page_js(),
+        media_type="application/javascript",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 @app.get("/room", response_class=HTMLResponse)
 def room_page(room_code: str, user_id: str, lang: Optional[str] = None):
     logger.info(f"GET /room called with room_code={room_code}, user_id={user_id}, lang={lang}")
@@ -129,9 +167,7 @@ def room_page(room_code: str, user_id: str, lang: Optional[str] = None):
             "<h2>Invalid room or user. Please (re)join from the app.</h2>",
             status_code=400,
         )
-    page = ROOM_HTML.replace("{{BACKEND_URL}}", BACKEND_URL).replace(
-        "{{FRONTEND_URL}}", FRONTEND_URL
-    )
+    page = _room_page_html()
     logger.info(f"Room page served for room_code={room_code}, user_id={user_id}")
     return HTMLResponse(page)
 
@@ -222,6 +258,12 @@ def room_info(room_code: str):
     return {"members": room["members"], "bot": bool(room["bot"])}
 
 
+@app.get("/healthz")
+def healthz():
+    # cheap target for the frontend to open (and keep) a warm connection to
+    return {"status": "ok"}
+
+
 @app.get("/login/google")
 async def login_google(request: Request):
     logger.info("GET /login/google called")
@@ -282,7 +324,7 @@ async def livekit_join_token(req: LiveKitJoinTokenReq):
     asyncio.create_task(_reconcile_bots(req.room_code))
 
     try:
-        meta = json.dumps({"language": req.language, "voice": req.voice})
+        meta = _dumps({"language": req.language, "voice": req.voice})
         at = (
             AccessToken(LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
             .with_identity(req.user_id)
@@ -314,6 +356,10 @@ async def _reconcile_bots(room_code: str):
         if room.get("bot"):
             await stop_room_bot(room_code)
             room["bot"] = None
+        if not room["members"]:
+            # nobody left to rejoin it; drop the entry so abandoned rooms don't pile up
+            rooms.pop(room_code, None)
+            logger.info(f"Room {room_code} is empty and was removed")
         return
 
     if not room.get("bot"):
@@ -629,9 +675,16 @@ ROOM_HTML = """
     </div>
 
     <script src="https://cdn.jsdelivr.net/npm/livekit-client/dist/livekit-client.umd.min.js"></script>
-    <script type="module">
+    <script type="module" src="/room.js?v={{ROOM_JS_VERSION}}"></script>
+</body>
+
+</html>
+"""
+
+ROOM_JS = """
         const BACKEND_URL = "{{BACKEND_URL}}";
         const FRONTEND_URL = "{{FRONTEND_URL}}";
+        const LIVEKIT_URL = "{{LIVEKIT_URL}}";
 
         (async () => {
             const qs = new URLSearchParams(location.search);
@@ -718,9 +771,25 @@ ROOM_HTML = """
                 box.scrollTop = box.scrollHeight;
             }
 
+            // data-channel message types; one codec pair is enough for every packet
+            const textDecoder = new TextDecoder();
+            const textEncoder = new TextEncoder();
+            const DATA_HANDLERS = {
+                chat: (m) => addChatMessage(m.from, m.text, m.from === USER),
+            };
+
+            // release the element's MediaStream before dropping it, otherwise the decoder
+            // stays alive until GC gets to the detached node
+            function removeAudioElement(identity) {
+                const existing = document.getElementById("audio-" + btoa(identity).replace(/=/g, ''));
+                if (!existing) return;
+                existing.pause();
+                existing.srcObject = null;
+                existing.remove();
+            }
+
             function attachAudioTrack(track, identity) {
-                let existing = document.getElementById("audio-" + btoa(identity).replace(/=/g, ''));
-                if (existing) existing.remove();
+                removeAudioElement(identity);
 
                 const audio = document.createElement("audio");
                 audio.id = "audio-" + btoa(identity).replace(/=/g, '');
@@ -737,6 +806,14 @@ ROOM_HTML = """
 
                 track.attach(audio);
 
+                // Ask the jitter buffer to render as soon as packets arrive instead of letting
+                // it settle on a 100ms+ target; older browsers only know playoutDelayHint.
+                const receiver = track.receiver;
+                if (receiver) {
+                    try { receiver.jitterBufferTarget = 0; } catch (e) {}
+                    try { receiver.playoutDelayHint = 0; } catch (e) {}
+                }
+
                 const tryPlay = () => {
                     audio.play().catch(() => {
                         showAudioNudge();
@@ -787,35 +864,47 @@ ROOM_HTML = """
 
 
 
+            async function requestToken() {
+                const resp = await fetch(TOKEN_ENDPOINT, {
+                    method: "POST",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify({ room_code: ROOM, user_id: LIVEKIT_IDENTITY, name: USER, language: preferredLanguage })
+                });
+                if (!resp.ok) throw new Error(await resp.text());
+                return resp.json();
+            }
+
+            // Warm up DNS/TLS to the LiveKit server while the user is still on the page.
+            // Only the connection is prepared: the token request registers the user with
+            // the room, so it waits for "Join Call".
+            function prefetchConnection() {
+                if (!LIVEKIT_URL) return;
+                room = room || new Room();
+                if (room.prepareConnection) {
+                    Promise.resolve(room.prepareConnection(LIVEKIT_URL))
+                        .catch((e) => console.warn("LiveKit preconnect failed", e));
+                }
+            }
+
             async function joinCall() {
                 if (!ROOM || !USER) {
                     alert("Missing room_code or user_id");
                     return;
                 }
                 document.getElementById('status').innerText = "Requesting token...";
-                let tokenResp;
+                let creds;
                 try {
-                    tokenResp = await fetch(TOKEN_ENDPOINT, {
-                        method: "POST",
-                        headers: { "Content-Type": "application/json" },
-                        body: JSON.stringify({ room_code: ROOM, user_id: LIVEKIT_IDENTITY, name: USER, language: preferredLanguage })
-                    });
+                    creds = await requestToken();
                 } catch (e) {
-                    console.error("Token fetch failed", e);
+                    console.error("Token request failed", e);
                     document.getElementById('status').innerText = "Token request failed";
                     return;
                 }
-                if (!tokenResp.ok) {
-                    const body = await tokenResp.text();
-                    console.error("Token error", body);
-                    document.getElementById('status').innerText = "Token request error";
-                    return;
-                }
-                const { token, url: livekitUrl } = await tokenResp.json();
+                const { token, url: livekitUrl } = creds;
                 document.getElementById('status').innerText = "Connecting to LiveKit...";
 
                 try {
-                    room = new Room();
+                    room = room || new Room();
                     await room.connect(livekitUrl, token, { name: USER });
                 } catch (e) {
                     console.error("LiveKit connect failed", e);
@@ -830,23 +919,51 @@ ROOM_HTML = """
                 room.on(RoomEvent.ParticipantConnected, onParticipantConnected);
                 room.on(RoomEvent.ParticipantDisconnected, onParticipantDisconnected);
 
+                // highlight tiles from LiveKit's own audio-level VAD; only changed tiles are touched
+                let activeSpeakers = new Set();
+                room.on(RoomEvent.ActiveSpeakersChanged, (speakers) => {
+                    const next = new Set(speakers.map(p => p.identity));
+                    for (const id of activeSpeakers) {
+                        if (!next.has(id)) tilesByIdentity.get(id)?.classList.remove("speaking");
+                    }
+                    for (const id of next) {
+                        if (!activeSpeakers.has(id)) tilesByIdentity.get(id)?.classList.add("speaking");
+                    }
+                    activeSpeakers = next;
+                });
+
                 room.on(RoomEvent.DataReceived, (payload, participant) => {
                     try {
-                        const parsed = JSON.parse(new TextDecoder().decode(payload));
-                        if (parsed.type === "chat") {
-                            addChatMessage(parsed.from, parsed.text, parsed.from === USER);
-                        }
+                        const parsed = JSON.parse(textDecoder.decode(payload));
+                        const handler = DATA_HANDLERS[parsed.type];
+                        if (handler) handler(parsed);
                     } catch (e) {
                         console.warn("Failed to parse data message", e);
                     }
                 });
 
+                // render and subscribe to whoever is already here before waiting on our own mic
+                for (const p of room.participants.values()) {
+                    onParticipantConnected(p);
+                }
+
                 try {
                     const useVideo = document.getElementById('useVideo').checked;
-                    const tracks = await createLocalTracks({ audio: true, video: useVideo });
+                    const tracks = await createLocalTracks({
+                        audio: {
+                            echoCancellation: true,
+                            noiseSuppression: true,
+                            autoGainControl: true,
+                            channelCount: 1,
+                            latency: { ideal: 0.01 },
+                        },
+                        video: useVideo,
+                    });
                     localAudioTrack = tracks.find(t => t.kind === Track.Kind.Audio);
                     localVideoTrack = tracks.find(t => t.kind === Track.Kind.Video);
 
+                    // audio and video publish independently, so negotiate them concurrently
+                    const publishes = [];
                     if (localAudioTrack) {
                         localAudioTrack.on("volume", (vol) => {
                             console.log("Mic volume:", vol);
@@ -860,12 +977,14 @@ ROOM_HTML = """
                         localAudioTrack.attach(testAudio);
                         document.body.appendChild(testAudio);
 
-                        await room.localParticipant.publishTrack(localAudioTrack);
-                        document.getElementById('muteBtn').disabled = false;
-                        document.getElementById('unmuteBtn').disabled = false;
+                        // speech-grade Opus: mono at 24kbps is plenty for the STT path and the listeners
+                        publishes.push(room.localParticipant.publishTrack(localAudioTrack, { audioPreset: { maxBitrate: 24000 } }).then(() => {
+                            document.getElementById('muteBtn').disabled = false;
+                            document.getElementById('unmuteBtn').disabled = false;
+                        }));
                     }
                     if (localVideoTrack) {
-                        await room.localParticipant.publishTrack(localVideoTrack);
+                        publishes.push(room.localParticipant.publishTrack(localVideoTrack));
                         const videoEl = document.createElement('video');
                         videoEl.autoplay = true;
                         videoEl.playsInline = true;
@@ -875,13 +994,11 @@ ROOM_HTML = """
                         container.style.display = "block";
                         container.appendChild(videoEl);
                     }
+                    await Promise.all(publishes);
                 } catch (e) {
                     console.error("Track publish failed", e);
                 }
 
-                for (const p of room.participants.values()) {
-                    onParticipantConnected(p);
-                }
                 joined = true;
             }
 
@@ -940,6 +1057,7 @@ ROOM_HTML = """
                 participants.delete(participant.identity);
                 removeParticipantListEntry(participant.identity);
                 removeTile(participant.identity);
+                removeAudioElement(participant.identity);
             }
 
             // Buttons
@@ -962,16 +1080,13 @@ ROOM_HTML = """
                 const text = input.value.trim();
                 if (!text || !room) return;
                 const payload = JSON.stringify({ type: "chat", from: USER, text });
-                room.localParticipant.publishData(new TextEncoder().encode(payload), DataPacket_Kind.RELIABLE);
+                room.localParticipant.publishData(textEncoder.encode(payload), DataPacket_Kind.RELIABLE);
                 addChatMessage(USER, text, true);
                 input.value = "";
             });
 
+            if (ROOM && USER) prefetchConnection();
             document.getElementById('status').innerText = "Ready — click Join Call to start";
             if (preferredLanguage) document.getElementById('myLang').innerText = preferredLanguage;
         })();
-    </script>
-</body>
-
-</html>
 """
@@ -1,35 +1,79 @@
 import json
 import os
-import io
+import asyncio
+import re
 import wave
+import struct
 import logging
 import base64
+import hashlib
+import threading
+from types import MappingProxyType
+import queue
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import httpx
+from functools import cache, lru_cache
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from cachetools import LRUCache
 from dotenv import load_dotenv
 from murf import Murf
 from io import BytesIO
 import numpy as np
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-)
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s"
+    )
 logger = logging.getLogger("murf_pipeline")
 
-load_dotenv()
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Explicit path: a bare load_dotenv() searches parent directories on every import
+load_dotenv(os.path.join(ROOT_DIR, ".env"))
 MURF_API_KEY = os.getenv("MURF_API_KEY")
 if not MURF_API_KEY:
     logger.error("MURF_API_KEY not found in environment")
     raise RuntimeError("Please set MURF_API_KEY in your .env file or environment variables.")
 
-logger.info("Initializing Murf client...")
-client = Murf(api_key=MURF_API_KEY)
-logger.info("Murf client initialized successfully")
+# Reuse the client (and its warm connection pool) if the module is reloaded
+if "client" not in globals():
+    logger.info("Initializing Murf client...")
+    _murf_http = httpx.Client(
+        timeout=60,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+    client = Murf(api_key=MURF_API_KEY, httpx_client=_murf_http)
+    logger.info("Murf client initialized successfully")
 
 _voice_cache = None
-_default_voice_cache = {}
+_voice_by_locale = {}
+
+_http = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.1))
+_http.mount("https://", _http_adapter)
+_http.mount("http://", _http_adapter)
+
+_stt_cache = LRUCache(maxsize=2048)
+_stt_cache_lock = threading.Lock()
+_translate_cache = LRUCache(maxsize=4096)
+_translate_cache_lock = threading.Lock()
+
+TTS_CACHE_DIR = os.getenv(
+    "TTS_CACHE_DIR",
+    os.path.join(ROOT_DIR, ".cache", "tts"),
+)
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Running estimate of the cache size; writes add to it and eviction resets it from disk
+_tts_cache_bytes = 0
+_tts_cache_bytes_lock = threading.Lock()
+_tts_evict_lock = threading.Lock()
 
-LANGUAGE_CODE_MAP = {
+LANGUAGE_CODE_MAP = MappingProxyType({
     "English - US & Canada": "en-US",
     "English - UK": "en-UK",
     "English - India": "en-IN",
@@ -52,36 +96,218 @@ LANGUAGE_CODE_MAP = {
     "Slovak - Slovakia": "sk-SK",
     "Polish - Poland": "pl-PL",
     "Greek - Greece": "el-GR"
-}
+})
+
+_ALL_CODES = frozenset(LANGUAGE_CODE_MAP.values())
+_SHORT_TO_LOCALE = {}
+for _locale in LANGUAGE_CODE_MAP.values():
+    _SHORT_TO_LOCALE.setdefault(_locale.split("-")[0], _locale)
 
 
 HADRA_API_URL = os.getenv("HADRA_API_URL")
+# Send audio as the raw request body instead of a multipart upload (for endpoints that accept audio/wav directly)
+HADRA_API_RAW_BODY = os.getenv("HADRA_API_RAW_BODY", "").lower() in ("1", "true", "yes")
 HF_API_KEY = os.getenv("HUGGINGFACE_API_KEY")
 HF_API_URL = "https://api-inference.huggingface.co/models"
 
-
+WHISPER_MODEL_DIR = os.getenv(
+    "WHISPER_MODEL_DIR",
+    os.path.join(ROOT_DIR, "models", "whisper-large-v3-ct2"),
+)
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "auto")
+WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "int8_float16")
+
+try:
+    from faster_whisper import WhisperModel
+except Exception:
+    WhisperModel = None
+
+try:
+    from faster_whisper.vad import get_speech_timestamps
+except Exception:
+    get_speech_timestamps = None
+
+# Optional per-locale local CTC models, e.g. WAV2VEC2_MODELS='{"ta-IN": "<model id or path>"}'
+WAV2VEC2_MODELS = json.loads(os.getenv("WAV2VEC2_MODELS", "{}"))
+
+try:
+    from transformers import Wav2Vec2Processor
+except Exception:
+    Wav2Vec2Processor = None
+
+try:
+    import torch
+    from transformers import Wav2Vec2ForCTC
+except Exception:
+    torch = None
+    Wav2Vec2ForCTC = None
+
+try:
+    import onnxruntime as ort
+except Exception:
+    ort = None
+
+try:
+    import webrtcvad
+except Exception:
+    webrtcvad = None
+
+VAD_FRAME_MS = 30
+VAD_PAD_MS = 300
+# -35 dB below the loudest frame counts as silence
+VAD_ENERGY_RATIO = 10 ** (-35 / 20)
+
+_whisper_model = None
+_whisper_lock = threading.Lock()
+_wav2vec2_models = {}
+_wav2vec2_lock = threading.Lock()
+
+
+@cache
 def resolve_language(user_choice: str, default="hi-IN") -> str:
     """Map user choice to STT-compatible language code."""
     return LANGUAGE_CODE_MAP.get(user_choice, default)
 
+@cache
 def normalize_language(code: str) -> str:
     """Convert human language string or shorthand to Murf locale."""
+    locale = LANGUAGE_CODE_MAP.get(code)
+    if locale:
+        return locale
     if not code:
         logger.warning("No language code provided. Defaulting to hi-IN")
         return "hi-IN"
-    if code in LANGUAGE_CODE_MAP:
-        logger.debug("Normalized %s -> %s", code, LANGUAGE_CODE_MAP[code])
-        return LANGUAGE_CODE_MAP[code]
-    if "-" in code:
-        logger.debug("Using provided language code: %s", code)
+    if code in _ALL_CODES or "-" in code:
         return code
+    # only bare ISO 639-1 codes ("en", "ta"); a prefix of a display name is not a code
+    locale = _SHORT_TO_LOCALE.get(code.lower()) if len(code) == 2 else None
+    if locale:
+        return locale
     logger.warning("Unsupported language code '%s'. Defaulting to hi-IN", code)
     return "hi-IN"
 
 
+@cache
+def _whisper_language(code):
+    """Map a display name or locale ("hi-IN") to Whisper's two-letter code."""
+    if not code:
+        return None
+    locale = LANGUAGE_CODE_MAP.get(code, code)
+    return locale.split("-")[0].lower() or None
+
+
+def local_stt_available():
+    """True if speech_to_text may run a local model (without loading it)."""
+    whisper = WhisperModel is not None and os.path.isdir(WHISPER_MODEL_DIR)
+    return whisper or (bool(WAV2VEC2_MODELS) and Wav2Vec2Processor is not None)
+
+
+def get_whisper_model():
+    """Load the CTranslate2 int8 Whisper model once; None if not available."""
+    global _whisper_model
+    if _whisper_model is not None:
+        return _whisper_model
+    if WhisperModel is None or not os.path.isdir(WHISPER_MODEL_DIR):
+        return None
+    with _whisper_lock:
+        if _whisper_model is None:
+            _whisper_model = _load_whisper()
+    return _whisper_model
+
+
+def _load_whisper():
+    logger.info("Loading local Whisper model from %s (device=%s, compute_type=%s)",
+                WHISPER_MODEL_DIR, WHISPER_DEVICE, WHISPER_COMPUTE_TYPE)
+    try:
+        model = WhisperModel(
+            WHISPER_MODEL_DIR, device=WHISPER_DEVICE, compute_type=WHISPER_COMPUTE_TYPE
+        )
+        # One short greedy decode so kernels and the decoder cache are set up
+        # before the first real utterance.
+        segments, _ = model.transcribe(
+            np.zeros(16000, dtype=np.float32), beam_size=1, language="en",
+            condition_on_previous_text=False,
+        )
+        for _ in segments:
+            pass
+        logger.info("Local Whisper model loaded and warmed up")
+        return model
+    except Exception:
+        logger.exception("Failed to load local Whisper model, using STT API")
+        return None
+
+
+def get_wav2vec2_model(language):
+    """Load the local Wav2Vec2 (model, processor) configured for a language once; None if not available.
+
+    A model directory containing an exported `model.int8.onnx` is run with ONNX Runtime,
+    anything else with PyTorch.
+    """
+    locale = LANGUAGE_CODE_MAP.get(language, language)
+    model_id = WAV2VEC2_MODELS.get(locale)
+    if not model_id or Wav2Vec2Processor is None:
+        return None
+    with _wav2vec2_lock:
+        if locale not in _wav2vec2_models:
+            _wav2vec2_models[locale] = _load_wav2vec2(model_id, locale)
+        return _wav2vec2_models[locale]
+
+
+def _load_wav2vec2(model_id, locale):
+    onnx_path = os.path.join(model_id, "model.int8.onnx")
+    try:
+        if ort is not None and os.path.isfile(onnx_path):
+            providers = [p for p in ("CUDAExecutionProvider", "CPUExecutionProvider")
+                         if p in ort.get_available_providers()]
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            logger.info("Loading ONNX Wav2Vec2 model %s for %s (providers=%s)", onnx_path, locale, providers)
+            model = ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+        elif Wav2Vec2ForCTC is not None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            dtype = torch.float16 if device == "cuda" else torch.float32
+            logger.info("Loading local Wav2Vec2 model %s for %s (device=%s)", model_id, locale, device)
+            model = Wav2Vec2ForCTC.from_pretrained(model_id, torch_dtype=dtype).to(device).eval()
+        else:
+            logger.warning("No runtime available for Wav2Vec2 model %s", model_id)
+            return None
+        return model, Wav2Vec2Processor.from_pretrained(model_id)
+    except Exception:
+        logger.exception("Failed to load local Wav2Vec2 model %s", model_id)
+        return None
+
+
+def _transcribe_wav2vec2(w2v, audio_bytes, sample_rate):
+    """Greedy CTC decode of 16 kHz PCM16 (raw or WAV) with a local Wav2Vec2 model."""
+    kind = container_kind(audio_bytes)
+    if kind == "wav":
+        audio_bytes, sample_rate = _wav_to_pcm(audio_bytes)
+    elif kind is not None:
+        raise ValueError(f"Wav2Vec2 cannot decode {kind} input")
+    if audio_bytes is None or sample_rate != 16000:
+        raise ValueError("Wav2Vec2 needs 16 kHz mono PCM16 input")
+    model, processor = w2v
+    # Same normalisation the feature extractor applies, without its per-call
+    # padding/list handling: the model is fed directly.
+    audio = _pcm16_to_float32(audio_bytes)
+    if getattr(processor.feature_extractor, "do_normalize", True):
+        audio -= audio.mean()
+        audio /= np.sqrt(audio.var() + 1e-7)
+    input_values = audio[None, :]
+    if ort is not None and isinstance(model, ort.InferenceSession):
+        logits = model.run(None, {"input_values": input_values})[0]
+        ids = logits.argmax(axis=-1)
+    else:
+        input_values = torch.from_numpy(input_values).to(model.device, dtype=model.dtype, non_blocking=True)
+        with torch.inference_mode():
+            logits = model(input_values).logits
+        ids = torch.argmax(logits, dim=-1)
+    return processor.batch_decode(ids)[0].strip()
+
+
 def get_available_voices(force_refresh: bool = False):
     """Fetch all voices from Murf API (cached by default)."""
-    global _voice_cache
+    global _voice_cache, _voice_by_locale
     if _voice_cache is None or force_refresh:
         logger.info("Fetching available voices from Murf API...")
         try:
@@ -90,31 +316,29 @@ def get_available_voices(force_refresh: bool = False):
         except Exception:
             logger.exception("Failed to fetch voices from Murf API")
             raise
+        by_locale = {}
+        for v in _voice_cache:
+            locale = getattr(v, "locale", None) or ""
+            if locale:
+                by_locale.setdefault(locale, v.voice_id)
+                by_locale.setdefault(locale.split("-")[0], v.voice_id)
+        _voice_by_locale = by_locale
     return _voice_cache
 
 
 def get_default_voice(language: str) -> str:
     """Return a valid default voice_id for a given language."""
-    if _default_voice_cache.get(language):
-        return _default_voice_cache[language]
-
-    voices = get_available_voices()
-
-    logger.debug("Searching for default voice for language=%s", language)
+    if not _voice_by_locale:
+        get_available_voices()
 
-    for v in voices:
-        locale = getattr(v, "locale", None)
-        if locale and locale.startswith(language):
-            logger.info("Found default voice %s for %s", v.voice_id, language)
-            _default_voice_cache[language] = v.voice_id
-            return v.voice_id
+    voice_id = _voice_by_locale.get(language) or _voice_by_locale.get(language.split("-")[0])
+    if voice_id:
+        return voice_id
 
-    for v in voices:
-        locale = getattr(v, "locale", "")
-        if locale.startswith("hi-IN"):
-            logger.warning("No match found for %s. Falling back to Hindi voice=%s", language, v.voice_id)
-            _default_voice_cache[language] = v.voice_id
-            return v.voice_id
+    voice_id = _voice_by_locale.get("hi-IN")
+    if voice_id:
+        logger.warning("No match found for %s. Falling back to Hindi voice=%s", language, voice_id)
+        return voice_id
 
     logger.error("No valid voice found for %s and fallback failed", language)
     raise RuntimeError(f"No valid voice found for {language}")
@@ -122,24 +346,186 @@ def get_default_voice(language: str) -> str:
 
 
 
+# Container magic numbers, classified in one match instead of a startswith chain
+_CONTAINER_SNIFF = re.compile(rb"(?P<wav>RIFF.{4}WAVE)|(?P<ogg>OggS)|(?P<webm>\x1aE\xdf\xa3)|(?P<mp3>ID3)", re.S)
+_CONTAINER_MIME = {"wav": "audio/wav", "ogg": "audio/ogg", "webm": "audio/webm", "mp3": "audio/mpeg"}
+_SENTENCE_END = re.compile(r"[.?!\u0964\u3002\uff1f\uff01]$")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.?!\u0964\u3002\uff1f\uff01])\s+")
+# Unpunctuated speech is still handed downstream once it gets this long
+MAX_SENTENCE_WORDS = 80
+
+
+def _stt_cache_key(audio_bytes, sample_rate, target_language):
+    return (hashlib.blake2b(audio_bytes, digest_size=16).digest(), sample_rate, target_language)
+
+
+def _split_sentences(text):
+    sentences = []
+    for sentence in _SENTENCE_SPLIT.split(text):
+        words = sentence.split()
+        for i in range(0, len(words), MAX_SENTENCE_WORDS):
+            sentences.append(" ".join(words[i:i + MAX_SENTENCE_WORDS]))
+    return sentences
+
+
 def speech_to_text(audio_bytes, sample_rate=16000, target_language="hi"):
     """
     Use a single Whisper model for multilingual STT.
     Auto-detects source language, outputs transcription in target language if set.
+    Runs the local int8 CTranslate2 model when available, else the STT API.
+    Transcripts are cached by a hash of the audio bytes.
+    """
+    key = _stt_cache_key(audio_bytes, sample_rate, target_language)
+    with _stt_cache_lock:
+        cached = _stt_cache.get(key)
+    if cached is not None:
+        logger.info("STT cache hit (bytes=%d)", len(audio_bytes))
+        return cached
+
+    text = _speech_to_text_uncached(audio_bytes, sample_rate, target_language)
+    if text:
+        with _stt_cache_lock:
+            _stt_cache[key] = text
+    return text
+
+
+def speech_to_text_sentences(audio_bytes, sample_rate=16000, target_language="hi"):
+    """
+    Like speech_to_text, but yield the transcript one sentence at a time.
+    With the local model each sentence is yielded as soon as Whisper has decoded it,
+    so translation/TTS of the first sentence overlaps decoding of the rest.
+    """
+    key = _stt_cache_key(audio_bytes, sample_rate, target_language)
+    with _stt_cache_lock:
+        cached = _stt_cache.get(key)
+    if cached is not None:
+        logger.info("STT cache hit (bytes=%d)", len(audio_bytes))
+        yield from _split_sentences(cached)
+        return
+
+    model = get_whisper_model()
+    if model is None or get_wav2vec2_model(target_language) is not None:
+        yield from _split_sentences(speech_to_text(audio_bytes, sample_rate, target_language))
+        return
+
+    logger.info("Starting streaming STT (target=%s, sample_rate=%s, bytes=%d)",
+                target_language, sample_rate, len(audio_bytes))
+    sentences = []
+    pending = ""
+    try:
+        for seg in _transcribe_local(model, audio_bytes, sample_rate, target_language):
+            pending = f"{pending} {seg.text.strip()}".strip()
+            if pending and (_SENTENCE_END.search(pending) or pending.count(" ") + 1 >= MAX_SENTENCE_WORDS):
+                sentences.append(pending)
+                yield pending
+                pending = ""
+    except Exception:
+        logger.exception("Local Whisper transcription failed mid-stream")
+        if not sentences:
+            # nothing went out yet: take the full fallback chain and cache it like speech_to_text
+            text = _speech_to_text_uncached(audio_bytes, sample_rate, target_language)
+            if text:
+                with _stt_cache_lock:
+                    _stt_cache[key] = text
+            yield from _split_sentences(text)
+            return
+        # what was decoded is still heard, but a partial transcript is never cached
+        # under the key of the full audio
+        if pending:
+            yield pending
+        return
+    if pending:
+        sentences.append(pending)
+        yield pending
+
+    text = " ".join(sentences)
+    logger.info("STT result (local whisper, streamed): %s", text)
+    if text:
+        with _stt_cache_lock:
+            _stt_cache[key] = text
+
+
+def _transcribe_local(model, audio_bytes, sample_rate, target_language):
+    """Return faster-whisper's lazy segment generator for the given audio.
+
+    16 kHz PCM (raw or in a plain WAV) is handed over as a float32 array so the
+    model skips its ffmpeg/PyAV decode; anything else goes through a file object.
     """
+    kind = container_kind(audio_bytes)
+    if kind is None:
+        pcm, sr = audio_bytes, sample_rate
+    elif kind == "wav":
+        pcm, sr = _wav_to_pcm(audio_bytes)
+    else:
+        pcm, sr = None, None
+    if pcm is not None and sr == 16000:
+        audio_in = _pcm16_to_float32(pcm)
+    elif kind is not None:
+        audio_in = BytesIO(audio_bytes)
+    else:
+        audio_in = BytesIO(_pcm_to_wav_bytes(audio_bytes, sample_rate=sample_rate))
+    segments, _ = model.transcribe(
+        audio_in,
+        beam_size=1,
+        language=_whisper_language(target_language),
+        vad_filter=True,
+        condition_on_previous_text=False,
+    )
+    return segments
+
+
+def _speech_to_text_uncached(audio_bytes, sample_rate, target_language):
     logger.info("Starting STT (target=%s, sample_rate=%s, bytes=%d)",
                 target_language, sample_rate, len(audio_bytes))
 
-    if len(audio_bytes) >= 4 and audio_bytes[:4] == b'RIFF':
-        wav_bytes = audio_bytes
+    w2v = get_wav2vec2_model(target_language)
+    if w2v is not None:
+        try:
+            text = _transcribe_wav2vec2(w2v, audio_bytes, sample_rate)
+            logger.info("STT result (local wav2vec2): %s", text)
+            return text
+        except Exception:
+            logger.exception("Local Wav2Vec2 transcription failed, falling back")
+
+    model = get_whisper_model()
+    if model is not None:
+        try:
+            segments = _transcribe_local(model, audio_bytes, sample_rate, target_language)
+            text = " ".join(seg.text.strip() for seg in segments).strip()
+            logger.info("STT result (local whisper): %s", text)
+            return text
+        except Exception:
+            logger.exception("Local Whisper transcription failed, falling back to STT API")
+
+    return _transcribe_api(audio_bytes, sample_rate)
+
+
+def _transcribe_api(audio_bytes, sample_rate):
+    kind = container_kind(audio_bytes)
+    if kind is None:
+        pcm, sr = audio_bytes, sample_rate
+    elif kind == "wav":
+        pcm, sr = _wav_to_pcm(audio_bytes)
     else:
-        wav_bytes = _pcm_to_wav_bytes(
-            audio_bytes, sample_rate=sample_rate, sample_width=2, channels=1
-        )
+        pcm, sr = None, None
+
+    if pcm is not None:
+        voiced = _trim_silence(pcm, sr)
+        if not voiced:
+            logger.info("No speech detected by VAD, skipping STT API call")
+            return ""
+        wav_bytes = _pcm_to_wav_bytes(voiced, sample_rate=sr, sample_width=2, channels=1)
+        kind = "wav"
+    else:
+        wav_bytes = audio_bytes
+    mime = _CONTAINER_MIME.get(kind, "audio/wav")
 
-    files = {"file": ("audio.wav", BytesIO(wav_bytes), "audio/wav")}
     try:
-        response = requests.post(HADRA_API_URL, files=files, timeout=60)
+        if HADRA_API_RAW_BODY:
+            response = _http.post(HADRA_API_URL, data=wav_bytes, headers={"Content-Type": mime}, timeout=60)
+        else:
+            files = {"file": (f"audio.{kind or 'wav'}", wav_bytes, mime)}
+            response = _http.post(HADRA_API_URL, files=files, timeout=60)
         response.raise_for_status()
         result = response.json()
         text = result.get("text", "").strip()
@@ -150,52 +536,377 @@ def speech_to_text(audio_bytes, sample_rate=16000, target_language="hi"):
         return ""
 
 
+def container_kind(audio_bytes):
+    """Return "wav", "ogg", "webm" or "mp3" for a known container header, None for raw PCM."""
+    m = _CONTAINER_SNIFF.match(audio_bytes[:12])
+    return m.lastgroup if m else None
+
+
+def _pcm16_to_float32(pcm):
+    """PCM16LE bytes (or int16 array) -> float32 samples in [-1, 1)."""
+    samples = np.frombuffer(pcm, dtype="<i2") if isinstance(pcm, (bytes, bytearray, memoryview)) else pcm
+    if samples.dtype == np.float32:
+        return samples
+    # one fused multiply instead of astype() followed by a second float division
+    return np.multiply(samples, np.float32(1 / 32768), dtype=np.float32)
+
+
+def _wav_to_pcm(wav_bytes):
+    """Return (pcm_bytes, sample_rate) for mono PCM16 WAV, else (None, None)."""
+    try:
+        with wave.open(BytesIO(wav_bytes), "rb") as wf:
+            if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+                return None, None
+            return wf.readframes(wf.getnframes()), wf.getframerate()
+    except Exception:
+        logger.debug("Could not parse WAV input, sending as-is")
+        return None, None
+
+
+def _trim_silence(pcm_bytes, sample_rate):
+    """Drop non-speech from PCM16 before upload.
+
+    Silero VAD (from faster-whisper) keeps only voiced regions of 16 kHz audio;
+    otherwise leading/trailing silence is trimmed with webrtcvad or, failing
+    that, a frame energy threshold.
+    """
+    audio = np.frombuffer(pcm_bytes, dtype="<i2")
+    if get_speech_timestamps is not None and sample_rate == 16000:
+        try:
+            spans = get_speech_timestamps(_pcm16_to_float32(audio))
+        except Exception:
+            logger.exception("VAD failed, sending untrimmed audio")
+            return pcm_bytes
+        if not spans:
+            return b""
+        voiced = np.concatenate([audio[span["start"]:span["end"]] for span in spans]).tobytes()
+        logger.debug("VAD trimmed %d -> %d bytes", len(pcm_bytes), len(voiced))
+        return voiced
+
+    if len(audio) <= sample_rate:
+        return pcm_bytes
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    n_frames = len(audio) // frame
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    if webrtcvad is not None and sample_rate in (8000, 16000, 32000, 48000):
+        vad = webrtcvad.Vad(2)
+        voiced = np.fromiter((vad.is_speech(f.tobytes(), sample_rate) for f in frames), dtype=bool, count=n_frames)
+    else:
+        # compare per-frame power against the squared ratio: no sqrt per frame, and the
+        # einsum reduces without materialising a squared copy of the clip
+        f = frames.astype(np.float32)
+        power = np.einsum("ij,ij->i", f, f)
+        voiced = power > power.max() * VAD_ENERGY_RATIO ** 2
+    idx = np.flatnonzero(voiced)
+    if not len(idx):
+        return b""
+    # keep a little context on both sides so word edges are not clipped
+    pad = VAD_PAD_MS // VAD_FRAME_MS
+    start = max(0, idx[0] - pad) * frame
+    last = idx[-1] + 1 + pad
+    end = len(audio) if last >= n_frames else last * frame
+    trimmed = audio[start:end].tobytes()
+    logger.debug("Silence trimmed %d -> %d bytes", len(pcm_bytes), len(trimmed))
+    return trimmed
+
+
+
+
+_WAV_HDR_FMT = "<4sI4s4sIHHIIHH4sI"
 
 
 def _pcm_to_wav_bytes(pcm_bytes, sample_rate=16000, sample_width=2, channels=1):
-    """Wrap raw PCM16LE bytes in a WAV container."""
-    with BytesIO() as wav_io:
-        with wave.open(wav_io, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(sample_width)
-            wf.setframerate(sample_rate)
-            wf.writeframes(pcm_bytes)
-        return wav_io.getvalue()
+    """Wrap raw PCM16LE bytes in a WAV container (fixed 44-byte header)."""
+    n = len(pcm_bytes)
+    header = struct.pack(
+        _WAV_HDR_FMT,
+        b"RIFF", 36 + n, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate,
+        sample_rate * channels * sample_width, channels * sample_width, sample_width * 8,
+        b"data", n,
+    )
+    # a single concatenation copies the PCM once; requests would stream a bytearray
+    # body item by item, so the result has to be bytes anyway
+    return header + pcm_bytes
+
+
+
+TRANSLATE_BATCH_WINDOW = 0.02
+TRANSLATE_BATCH_MAX = 32
+# Callers give up on a translation after this long instead of waiting on a hung request
+TRANSLATE_TIMEOUT = 30
+
+_translate_inbox = queue.Queue()
+# Batches for different languages are sent concurrently; the batcher thread only groups
+_translate_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="murf-translate")
+_translate_batcher_thread = None
+_translate_batcher_lock = threading.Lock()
+
+
+def _translated_texts(resp):
+    items = resp.get("translations", []) if isinstance(resp, dict) else (getattr(resp, "translations", None) or [])
+    out = []
+    for item in items:
+        if isinstance(item, dict):
+            out.append(item.get("translated_text", "") or "")
+        else:
+            out.append(getattr(item, "translated_text", "") or "")
+    return out
+
+
+def _settle(fut, result=None, exc=None):
+    """Resolve a translation future unless its caller already timed it out."""
+    try:
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+    except InvalidStateError:
+        pass
+
+
+def _translate_batch(target_language, batch):
+    texts = [text for text, _ in batch]
+    logger.info("Translating %d text(s) to %s", len(texts), target_language)
+    try:
+        resp = client.text.translate(target_language=target_language, texts=texts)
+        translations = _translated_texts(resp)
+    except Exception as e:
+        logger.exception("Translation failed")
+        for _, fut in batch:
+            _settle(fut, exc=e)
+        return
+    for i, (_, fut) in enumerate(batch):
+        _settle(fut, translations[i] if i < len(translations) else "")
+
+
+def _translate_batcher():
+    """Coalesce translation requests arriving within TRANSLATE_BATCH_WINDOW into one call per language."""
+    while True:
+        pending = [_translate_inbox.get()]
+        deadline = time.monotonic() + TRANSLATE_BATCH_WINDOW
+        while True:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(_translate_inbox.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        by_language = {}
+        for text, target_language, fut in pending:
+            by_language.setdefault(target_language, []).append((text, fut))
+        for target_language, group in by_language.items():
+            for i in range(0, len(group), TRANSLATE_BATCH_MAX):
+                _translate_pool.submit(_translate_batch, target_language, group[i:i + TRANSLATE_BATCH_MAX])
+
 
+def _ensure_translate_batcher():
+    global _translate_batcher_thread
+    if _translate_batcher_thread is not None:
+        return
+    with _translate_batcher_lock:
+        if _translate_batcher_thread is None:
+            _translate_batcher_thread = threading.Thread(target=_translate_batcher, name="murf-translate", daemon=True)
+            _translate_batcher_thread.start()
 
 
 def translate_text_murf(text, target_language="hi-IN"):
-    logger.info("Translating text to %s (input length=%d)", target_language, len(text))
+    """Translate text via the batcher. Only non-empty results are cached, so failures are retried."""
+    key = (text, target_language)
+    with _translate_cache_lock:
+        cached = _translate_cache.get(key)
+    if cached is not None:
+        return cached
+
+    _ensure_translate_batcher()
+    fut = Future()
+    _translate_inbox.put((text, target_language, fut))
+    try:
+        translated = fut.result(timeout=TRANSLATE_TIMEOUT)
+    except FutureTimeoutError:
+        err = TimeoutError(f"Translation to {target_language} timed out after {TRANSLATE_TIMEOUT}s")
+        _settle(fut, exc=err)
+        raise err from None
+    logger.info("Translation complete. Output length=%d", len(translated))
+    if translated:
+        with _translate_cache_lock:
+            _translate_cache[key] = translated
+    return translated
+
+
+MURF_STREAM_URL = "https://api.murf.ai/v1/speech/stream"
+_murf_async_http = None
+
+
+def _get_murf_async_http():
+    global _murf_async_http
+    if _murf_async_http is None:
+        _murf_async_http = httpx.AsyncClient(
+            http2=True,
+            timeout=60,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _murf_async_http
+
+
+async def stream_speech_from_text_async(text, language="en-US", voice=None, sample_rate=24000):
+    """Yield raw PCM16LE mono chunks from Murf's streaming TTS straight off the socket as they are synthesized."""
+    if not voice:
+        voice = get_default_voice(language)
+
+    path = _tts_cache_path(text, language, voice, f"{sample_rate}.pcm")
+    cached = await asyncio.to_thread(_tts_cache_read, path)
+    if cached is not None:
+        yield cached
+        return
+
+    logger.info("Starting async streaming TTS: lang=%s, voice=%s, text_length=%d", language, voice, len(text))
+    payload = {
+        "text": text,
+        "voiceId": voice,
+        "format": "PCM",
+        "channelType": "MONO",
+        "sampleRate": float(sample_rate),
+    }
+    pieces = []
     try:
-        resp = client.text.translate(target_language=target_language, texts=[text])
-        translations = [item.get("translated_text", "") for item in resp.get("translations", [])]
-        translated = translations[0] if translations else ""
-        logger.info("Translation complete. Output length=%d", len(translated))
-        return translated
+        async with _get_murf_async_http().stream(
+            "POST", MURF_STREAM_URL, json=payload, headers={"api-key": MURF_API_KEY}
+        ) as r:
+            r.raise_for_status()
+            async for chunk in r.aiter_bytes(8192):
+                pieces.append(chunk)
+                yield chunk
     except Exception:
-        logger.exception("Translation failed")
+        logger.exception("Murf TTS async stream failed")
         raise
+    await asyncio.to_thread(_tts_cache_write, path, b"".join(pieces))
+
+
+def _tts_cache_path(text, language, voice, ext):
+    key = hashlib.blake2b(f"{text}|{language}|{voice}".encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, f"{key}.{ext}")
 
 
-def generate_speech_from_text(text, language="en-US", voice=None):
+def _tts_cache_read(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _tts_cache_write(path, blob):
+    if not blob:
+        return
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    except OSError:
+        logger.warning("Could not write TTS cache entry %s", path, exc_info=True)
+        return
+    global _tts_cache_bytes
+    with _tts_cache_bytes_lock:
+        _tts_cache_bytes += len(blob)
+        over = _tts_cache_bytes > TTS_CACHE_MAX_BYTES
+    if over:
+        _evict_tts_cache()
+
+
+def _evict_tts_cache():
+    """Trim the on-disk TTS cache to 90% of TTS_CACHE_MAX_BYTES, oldest entries first.
+
+    Evicting below the limit leaves headroom, so a full cache is not rescanned on every write.
+    This is bookkeeping only: errors are logged, never raised to the TTS call that wrote.
+    """
+    global _tts_cache_bytes
+    # one scan at a time; writers that lose the race just keep going
+    if not _tts_evict_lock.acquire(blocking=False):
+        return
+    try:
+        stats = []
+        with os.scandir(TTS_CACHE_DIR) as it:
+            for e in it:
+                # in-flight writes are renamed away under us; other workers may remove entries
+                if e.name.endswith(".tmp"):
+                    continue
+                try:
+                    if not e.is_file():
+                        continue
+                    st = e.stat()
+                except OSError:
+                    continue
+                stats.append((st.st_mtime, st.st_size, e.path))
+        total = sum(size for _, size, _ in stats)
+        if total > TTS_CACHE_MAX_BYTES:
+            target = TTS_CACHE_MAX_BYTES * 9 // 10
+            removed = 0
+            for _, size, path in sorted(stats):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+                if total <= target:
+                    break
+            logger.info("Evicted %d TTS cache entries (now %d bytes)", removed, total)
+        with _tts_cache_bytes_lock:
+            _tts_cache_bytes = total
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.warning("TTS cache eviction failed", exc_info=True)
+    finally:
+        _tts_evict_lock.release()
+
+
+def generate_speech_from_text(text, language="en-US", voice=None, sample_rate=24000):
+    """Synthesize text to an Ogg blob; 24 kHz suits voice over WebRTC, pass 44100 for high fidelity."""
     if not voice:
         voice = get_default_voice(language)
+    return _tts_cached(text, language, voice, sample_rate)
+
+
+@lru_cache(maxsize=512)
+def _tts_cached(text, language, voice, sample_rate):
+    path = _tts_cache_path(text, language, voice, f"{sample_rate}.ogg")
+    blob = _tts_cache_read(path)
+    if blob is None:
+        blob = _tts_uncached(text, language, voice, sample_rate)
+        logger.info("TTS audio: %d bytes at %d Hz", len(blob), sample_rate)
+        _tts_cache_write(path, blob)
+    return blob
+
+
+# encoded_audio is what the current SDK returns; the rest cover older response shapes
+_TTS_AUDIO_ATTRS = ("encoded_audio", "content", "audio", "audio_bytes", "data")
 
+
+def _tts_uncached(text, language, voice, sample_rate):
     logger.info("Starting TTS: lang=%s, voice=%s, text_length=%d", language, voice, len(text))
     response = None
     try:
         response = client.text_to_speech.generate(
             text=text,
             voice_id=voice,
-            format="MP3",
-            sample_rate=44100.0,
+            format="OGG",
+            sample_rate=float(sample_rate),
+            encode_as_base_64=True,
         )
         logger.info("TTS generation successful")
     except Exception:
         logger.exception("Murf TTS generate() failed")
         raise
 
-    if isinstance(response, (bytes, bytearray)):
+    if type(response) is bytes:
+        return response
+    if isinstance(response, (bytearray, memoryview)):
         return bytes(response)
 
     if isinstance(response, dict) and "audio" in response:
@@ -207,22 +918,24 @@ def generate_speech_from_text(text, language="en-US", voice=None):
                 logger.exception("Failed to base64 decode audio data")
                 raise
 
-    for attr in ("content", "audio", "audio_bytes", "data", "encoded_audio"):
-        if hasattr(response, attr):
-            blob = getattr(response, attr)
-            if blob:
-                if isinstance(blob, (bytes, bytearray)):
-                    return bytes(blob)
-                if isinstance(blob, str):
-                    try:
-                        return base64.b64decode(blob)
-                    except Exception:
-                        logger.debug("Attribute %s not base64 decodable", attr)
-                        continue
+    for attr in _TTS_AUDIO_ATTRS:
+        blob = getattr(response, attr, None)
+        if blob:
+            if type(blob) is bytes:
+                return blob
+            if isinstance(blob, (bytearray, memoryview)):
+                return bytes(blob)
+            if isinstance(blob, str):
+                try:
+                    return base64.b64decode(blob)
+                except Exception:
+                    logger.debug("Attribute %s not base64 decodable", attr)
+                    continue
 
     if hasattr(response, "audio_file") and response.audio_file:
+        logger.warning("TTS response had no inline audio, fetching signed URL")
         try:
-            r = requests.get(response.audio_file, timeout=10)
+            r = _http.get(response.audio_file, timeout=10)
             r.raise_for_status()
             return r.content
         except Exception:
@@ -232,3 +945,17 @@ def generate_speech_from_text(text, language="en-US", voice=None):
     logger.error("Unsupported Murf TTS response: %r", response)
     raise RuntimeError("Unsupported Murf TTS response shape")
 
+
+def _prewarm():
+    """Trim the TTS disk cache, then fetch the voice list and open a pooled TLS connection
+    before the first request needs them."""
+    _evict_tts_cache()
+    try:
+        get_available_voices()
+        _murf_http.head("https://api.murf.ai/", timeout=5)
+    except Exception:
+        logger.warning("Murf prewarm failed; will retry lazily", exc_info=True)
+
+
+if os.getenv("MURF_PREWARM", "1").lower() not in ("0", "false", "no"):
+    threading.Thread(target=_prewarm, name="murf-prewarm", daemon=True).start()
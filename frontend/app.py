@@ -1,14 +1,25 @@
-import sys, os, json
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+import sys, os, json, threading
+# Streamlit re-executes this script on every rerun; only add the repo root once
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.append(ROOT_DIR)
 import streamlit as st
 import requests
-from urllib.parse import quote
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
 
 BACKEND_URL = "https://murf-coding-challenge-4-multilingual.onrender.com"
 
-def local_css():
-    st.markdown(
-        """
+LANGUAGE_OPTIONS = (
+    "English - US & Canada", "English - UK", "English - India", "English - Australia", "English - Scotland",
+    "Spanish - Mexico", "Spanish - Spain", "French - France", "German - Germany", "Italian - Italy",
+    "Dutch - Netherlands", "Portuguese - Brazil", "Chinese - China", "Japanese - Japan", "Korean - Korea",
+    "Hindi - India", "Tamil - India", "Bengali - India", "Croatian - Croatia", "Slovak - Slovakia",
+    "Polish - Poland", "Greek - Greece",
+)
+
+LOCAL_CSS = """
         <style>
         .stApp {
             background: linear-gradient(-45deg, #6a11cb, #2575fc, #00c9ff, #92fe9d);
@@ -48,22 +59,42 @@ def local_css():
         header[data-testid="stHeader"] { background: linear-gradient(to right, #141E30, #243B55); }
         section[data-testid="stSidebar"] { background: #1c1c1c; }
         </style>
-        """,
-        unsafe_allow_html=True
-    )
+        """
+# collapse the indentation once so every rerun ships the smallest payload
+LOCAL_CSS = " ".join(LOCAL_CSS.split())
 
-def ws_url_from_backend(burl: str):
-    if burl.startswith("https://"):
-        return "wss://" + burl[len("https://"):]
-    if burl.startswith("http://"):
-        return "ws://" + burl[len("http://"):]
-    return burl
+def local_css():
+    # Streamlit drops any element a rerun does not emit again, so the style block
+    # has to be re-sent each run; keep it a prebuilt constant rather than gating it.
+    st.markdown(LOCAL_CSS, unsafe_allow_html=True)
+
+# (connect, read): the read budget covers a cold start of the hosted backend
+HTTP_TIMEOUT = (5, 60)
+
+@st.cache_resource
+def http_session():
+    """One keep-alive session per server process so reruns skip the TLS handshake to the backend."""
+    session = requests.Session()
+    # only connection failures are retried: create_room/join_room are POSTs and must not run twice
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                          max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def prewarm_backend(session):
+    """Open the pooled connection in the background so the first room POST skips the TLS handshake."""
+    def _ping():
+        try:
+            session.get(f"{BACKEND_URL}/healthz", timeout=HTTP_TIMEOUT)
+        except requests.RequestException:
+            pass
+    threading.Thread(target=_ping, daemon=True).start()
 
 class AudioCallApp:
     def __init__(self):
         self.backend_url = BACKEND_URL
-        self.muted = False
-        local_css()
+        self.http = http_session()
 
     def login(self):
         st.title("✨ 🎧 Welcome to Multilingual Audio ChatRoom ✨")
@@ -82,45 +113,53 @@ class AudioCallApp:
         if "user_id" in query_params and "name" in query_params:
             st.session_state['user_id'] = query_params["user_id"]
             st.session_state['name'] = query_params["name"]
-            st.success(f"✅ Logged in as {st.session_state['name']}")
+            prewarm_backend(self.http)
+            # the rerun lands in the early-return branch above, which shows the banner
             st.rerun()
 
     def show_room_options(self):
         st.markdown("<div class='subheader'>🛠 Choose Your Room Option</div>", unsafe_allow_html=True)
 
-        language = st.selectbox("🌐 Choose Your Language", ["English - US & Canada", "English - UK", "English - India", "English - Australia", "English - Scotland", "Spanish - Mexico", "Spanish - Spain", "French - France" , "German - Germany", "Italian - Italy", "Dutch - Netherlands", "Portuguese - Brazil", "Chinese - China", "Japanese - Japan", "Korean - Korea", "Hindi - India", "Tamil - India", "Bengali - India", "Croatian - Croatia", "Slovak - Slovakia", "Polish - Poland", "Greek - Greece"], key="language")
+        language = st.selectbox("🌐 Choose Your Language", LANGUAGE_OPTIONS, key="language")
+        user = st.session_state['user_id']
 
         col1, col2 = st.columns(2)
 
         with col1:
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            st.markdown("<h3>➕ Create Room</h3>", unsafe_allow_html=True)
+            st.markdown('<div class="glass-card"><h3>➕ Create Room</h3></div>', unsafe_allow_html=True)
             public = st.checkbox("🌍 Public Room?", value=True)
             if st.button("🚀 Create Room"):
-                resp = requests.post(f"{self.backend_url}/create_room",
-                                    json={"user_id": st.session_state['user_id'], "public": public , "language" : language})
-                if resp.status_code == 200:
-                    st.session_state['room_code'] = resp.json()["room_code"]
-                    st.success(f"🎉 Room created: `{st.session_state['room_code']}`")
-                    st.rerun()
+                try:
+                    resp = self.http.post(f"{self.backend_url}/create_room",
+                                        json={"user_id": user, "public": public , "language" : language},
+                                        timeout=HTTP_TIMEOUT)
+                except requests.RequestException as e:
+                    st.error(f"❌ Failed to create room: {e}")
                 else:
-                    st.error(f"❌ Failed to create room: {resp.text}")
-            st.markdown('</div>', unsafe_allow_html=True)
+                    if resp.status_code == 200:
+                        code = st.session_state['room_code'] = resp.json()["room_code"]
+                        st.session_state['_toast'] = f"🎉 Room created: `{code}`"
+                        st.rerun()
+                    else:
+                        st.error(f"❌ Failed to create room: {resp.text}")
 
         with col2:
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            st.markdown("<h3>🔑 Join Room</h3>", unsafe_allow_html=True)
+            st.markdown('<div class="glass-card"><h3>🔑 Join Room</h3></div>', unsafe_allow_html=True)
             room_code = st.text_input("Room Code")
             if st.button("➡️ Join Room"):
-                resp = requests.post(f"{self.backend_url}/join_room",
-                                    json={"user_id": st.session_state['user_id'], "room_code": room_code or None , "language" : language})
-                if resp.status_code == 200:
-                    st.session_state['room_code'] = resp.json()["room_code"]
-                    st.success(f"✅ Joined room: `{st.session_state['room_code']}`")
-                    st.rerun()
+                try:
+                    resp = self.http.post(f"{self.backend_url}/join_room",
+                                        json={"user_id": user, "room_code": room_code or None , "language" : language},
+                                        timeout=HTTP_TIMEOUT)
+                except requests.RequestException as e:
+                    st.error(f"❌ Failed to join room: {e}")
                 else:
-                    st.error(f"❌ Failed to join room: {resp.text}")
-            st.markdown('</div>', unsafe_allow_html=True)
+                    if resp.status_code == 200:
+                        code = st.session_state['room_code'] = resp.json()["room_code"]
+                        st.session_state['_toast'] = f"✅ Joined room: `{code}`"
+                        st.rerun()
+                    else:
+                        st.error(f"❌ Failed to join room: {resp.text}")
 
     def run_audio_call(self):
         st.markdown("<div class='subheader'>🎤 Audio Call Room</div>", unsafe_allow_html=True)
@@ -137,11 +176,16 @@ class AudioCallApp:
             </div>
         """, unsafe_allow_html=True)
 
-        room_url = f"{self.backend_url}/room?room_code={quote(room)}&user_id={quote(user)}&lang={quote(language)}"
+        room_url = f"{self.backend_url}/room?" + urlencode({"room_code": room, "user_id": user, "lang": language})
         st.link_button("🚪 Enter Room (opens in new tab)", room_url, use_container_width=True)
         st.info("Keep this tab open for creating/sharing rooms. The voice room opens in a new tab with mic access.")
 
     def run(self):
+        local_css()
+        # messages queued right before an st.rerun() would otherwise be rendered and thrown away
+        toast = st.session_state.pop('_toast', None)
+        if toast:
+            st.toast(toast)
         if "user_id" not in st.session_state:
             self.login()
             return
@@ -150,9 +194,13 @@ class AudioCallApp:
         else:
             self.run_audio_call()
 
+@st.cache_resource
+def get_app():
+    """AudioCallApp holds no per-user state (that all lives in st.session_state), so one instance serves every session."""
+    return AudioCallApp()
+
 def main():
-    app = AudioCallApp()
-    app.run()
+    get_app().run()
 
 if __name__ == "__main__":
     main()